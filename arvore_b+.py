@@ -1,6 +1,16 @@
 import tkinter as tk
+from bisect import bisect_left, bisect_right
 from tkinter import ttk, messagebox, scrolledtext
 
+try:
+    import numpy as np
+except ImportError: # NumPy é opcional; sem ela as consultas em lote usam Python puro
+    np = None
+
+# Fatias do lote menores que isso seguem com bisect: converter as chaves do nó
+# para array custa mais que buscá-las uma a uma
+NUMPY_MIN_SLICE = 32
+
 # --------------------------------------------------------------------------
 # PARTE 1: LÓGICA DA ÁRVORE B+ (BACKEND COM REMOÇÃO 100% CORRETA)
 # --------------------------------------------------------------------------
@@ -20,6 +30,13 @@ class BPlusTree:
             raise ValueError("A ordem da Árvore B+ (t) deve ser no mínimo 2.")
         self.root = BPlusTreeNode(t, leaf=True)
         self.t = t
+        # Incrementado a cada modificação; invalida o caminho guardado pelos cursores
+        self._version = 0
+        # Ponto de retomada da desfragmentação incremental: (nível, chave)
+        self._defrag_state = None
+
+    def cursor(self):
+        return BPlusTreeCursor(self)
 
     def insert(self, k):
         if self.search(k):
@@ -29,9 +46,10 @@ class BPlusTree:
             temp = BPlusTreeNode(self.t, leaf=False)
             temp.children.append(self.root)
             self.root.parent = temp
-            self._split_child(temp, 0)
+            self._split_child(temp, 0, k)
             self.root = temp
         self._insert_non_full(self.root, k)
+        self._version += 1
         return True
 
     def _insert_non_full(self, x, k):
@@ -44,11 +62,11 @@ class BPlusTree:
             while i >= 0 and k < x.keys[i]: i -= 1
             i += 1
             if len(x.children[i].keys) == 2 * self.t - 1:
-                self._split_child(x, i)
+                self._split_child(x, i, k)
                 if k > x.keys[i]: i += 1
             self._insert_non_full(x.children[i], k)
 
-    def _split_child(self, x, i):
+    def _split_child(self, x, i, k=None):
         t = self.t
         y = x.children[i]
         z = BPlusTreeNode(t, leaf=y.leaf, parent=x)
@@ -62,6 +80,10 @@ class BPlusTree:
             x.keys.insert(i, mid_key)
         else:
             mid_key_index = t -1 # Na B+, o split de folha copia a chave
+            # Inserção no fim da folha mais à direita (chaves crescentes): divide de
+            # forma desigual, deixando a folha esquerda cheia em vez de meio vazia
+            if y.next is None and k is not None and k > y.keys[-1]:
+                mid_key_index = len(y.keys) - 1
             mid_key = y.keys[mid_key_index]
             z.keys = y.keys[mid_key_index:]
             y.keys = y.keys[:mid_key_index]
@@ -80,12 +102,121 @@ class BPlusTree:
             if key == k: return x
         return None
 
+    # --- Consultas em Lote ---
+    def multi_get(self, keys):
+        # Para cada chave devolve a folha que a contém (ou None), como search().
+        # O resultado é um ndarray quando o NumPy está instalado e uma lista sem ele
+        leaves, _ = self._search_many(keys)
+        return leaves
+
+    def contains_many(self, keys):
+        # Pertinência de cada chave: ndarray de bool com NumPy, lista de bool sem ele
+        _, found = self._search_many(keys)
+        return found
+
+    def _search_many(self, keys):
+        # Com NumPy o resultado vem como ndarray; sem ela, como listas
+        if np is None:
+            return self._search_many_python(keys)
+        if not isinstance(keys, np.ndarray):
+            keys = list(keys)
+        array = np.asarray(keys)
+        # O asarray converte entradas heterogêneas (ex.: ["A", 1] vira ["A", "1"]);
+        # nesses casos usa a busca com bisect, que compara como search()
+        mixed = isinstance(keys, list) and (
+            array.ndim != 1
+            or (array.dtype.kind in "US" and not all(isinstance(k, (str, bytes)) for k in keys)))
+        # Chaves de tipo diferente das da árvore (ex.: números contra letras) também
+        # vão para o bisect, que levanta TypeError como search()
+        if not mixed and self.root.keys:
+            mixed = self._kind(array) != self._kind(np.asarray(self.root.keys))
+        if mixed or array.dtype.kind == "O":
+            # Listas seguem sem conversão, para não comparar os valores já convertidos
+            if isinstance(keys, list):
+                flat, shape = keys, (len(keys),)
+            else:
+                flat, shape = array.ravel().tolist(), array.shape
+            leaves, found = self._search_many_python(flat)
+            return (np.array(leaves, dtype=object).reshape(shape),
+                    np.array(found, dtype=bool).reshape(shape))
+        return self._search_many_numpy(array)
+
+    @staticmethod
+    def _kind(array):
+        kind = array.dtype.kind
+        return "n" if kind in "biuf" else kind
+
+    def _search_many_numpy(self, keys):
+        shape, keys = keys.shape, keys.ravel()
+        order = np.argsort(keys, kind="stable")
+        batch = keys[order]
+        leaves = np.full(len(batch), None, dtype=object)
+        found = np.zeros(len(batch), dtype=bool)
+        stack, small = [(self.root, 0, len(batch))], []
+        while stack:
+            node, lo, hi = stack.pop()
+            if lo == hi or not node.keys: continue
+            if hi - lo < NUMPY_MIN_SLICE:
+                small.append((node, lo, hi))
+                continue
+            node_keys = np.asarray(node.keys)
+            part = batch[lo:hi]
+            if node.leaf:
+                pos = np.searchsorted(node_keys, part)
+                hit = node_keys[np.minimum(pos, len(node_keys) - 1)] == part
+                idx = order[lo:hi][hit]
+                found[idx] = True
+                leaves[idx] = node
+            else:
+                # O lote está ordenado: cada separador corta uma fatia contígua dele
+                cuts = [lo, *(lo + np.searchsorted(part, node_keys)).tolist(), hi]
+                for i, child in enumerate(node.children):
+                    stack.append((child, cuts[i], cuts[i + 1]))
+        if small:
+            self._route_python(small, batch.tolist(), order.tolist(), leaves, found)
+        return leaves.reshape(shape), found.reshape(shape)
+
+    def _search_many_python(self, keys):
+        keys = list(keys)
+        order = sorted(range(len(keys)), key=keys.__getitem__)
+        batch = [keys[i] for i in order]
+        leaves = [None] * len(batch)
+        found = [False] * len(batch)
+        self._route_python([(self.root, 0, len(batch))], batch, order, leaves, found)
+        return leaves, found
+
+    def _route_python(self, stack, batch, order, leaves, found):
+        # Desce cada fatia (nó, início, fim) do lote ordenado até as folhas
+        while stack:
+            node, lo, hi = stack.pop()
+            if lo == hi or not node.keys: continue
+            if hi - lo == 1:
+                # Chave sozinha na fatia: desce direto, sem passar pela pilha
+                while not node.leaf: node = node.children[bisect_right(node.keys, batch[lo])]
+            keys = node.keys
+            if node.leaf:
+                for j in range(lo, hi):
+                    pos = bisect_left(keys, batch[j])
+                    if pos < len(keys) and keys[pos] == batch[j]:
+                        found[order[j]] = True
+                        leaves[order[j]] = node
+            else:
+                # Localiza o filho da primeira chave pendente e leva junto todas
+                # as chaves seguintes que caem no mesmo filho
+                j = lo
+                while j < hi:
+                    i = bisect_right(keys, batch[j])
+                    end = bisect_left(batch, keys[i], j, hi) if i < len(keys) else hi
+                    stack.append((node.children[i], j, end))
+                    j = end
+
     # --- Funções de Remoção ---
     def delete(self, key):
         leaf_node = self.search(key)
         if not leaf_node:
             raise ValueError(f"Chave '{key}' não encontrada na árvore.")
         self._delete_entry(leaf_node, key)
+        self._version += 1
 
     def _delete_entry(self, node, key):
         # Remove a chave do nó
@@ -184,6 +315,284 @@ class BPlusTree:
         if len(parent.keys) < self.t - 1:
             self._handle_underflow(parent)
 
+    # --- Estatísticas e Desfragmentação ---
+    def stats(self):
+        capacity = 2 * self.t - 1
+        levels, level = [], [self.root]
+        while level:
+            levels.append(level)
+            level = [child for node in level for child in node.children]
+        # Histograma de ocupação em faixas de 10%; nós cheios entram na última faixa
+        histogram = [0] * 10
+        for level in levels:
+            for node in level:
+                histogram[min(len(node.keys) * 10 // capacity, 9)] += 1
+        leaves = levels[-1]
+        total_keys = sum(len(leaf.keys) for leaf in leaves)
+        chain_length, leaf = 0, leaves[0]
+        while leaf:
+            chain_length += 1
+            leaf = leaf.next
+        return {
+            "height": len(levels),
+            "nodes_per_level": [len(level) for level in levels],
+            "fill_histogram": histogram,
+            "keys": total_keys,
+            "avg_keys_per_leaf": total_keys / len(leaves),
+            "leaf_fill_factor": total_keys / (len(leaves) * capacity),
+            "leaf_chain_length": chain_length,
+        }
+
+    def defragment(self, budget=16):
+        # Examina no máximo `budget` nós, fundindo pares de irmãos adjacentes cujas
+        # chaves cabem num só nó. Percorre as folhas e depois cada nível interno,
+        # retomando de onde parou na chamada seguinte. Retorna o número de fusões.
+        merges = 0
+        level, key = self._defrag_state or (0, None)
+        node = self._node_at_level(level, key)
+        while budget > 0 and node is not None:
+            budget -= 1
+            parent = node.parent
+            i = parent.children.index(node)
+            if i + 1 < len(parent.children) and self._can_repack(parent, i):
+                self._repack(parent, i)
+                merges += 1
+                if node.parent is None: node = None # O nó virou a raiz
+                continue
+            node = self._next_on_level(node)
+            if node is None:
+                level += 1
+                node = self._node_at_level(level, None)
+        self._defrag_state = None if node is None else (level, self._first_key(node))
+        return merges
+
+    def _node_at_level(self, level, key):
+        # Nível contado a partir das folhas (0); a raiz não tem irmãos para fundir
+        height, node = 0, self.root
+        while not node.leaf:
+            height += 1
+            node = node.children[0]
+        if level >= height:
+            return None
+        node = self.root
+        for _ in range(height - level):
+            node = node.children[0 if key is None else bisect_right(node.keys, key)]
+        return node
+
+    def _next_on_level(self, node):
+        if node.leaf:
+            return node.next
+        depth = 0
+        while node.parent is not None:
+            parent = node.parent
+            i = parent.children.index(node)
+            if i + 1 < len(parent.children):
+                node = parent.children[i + 1]
+                for _ in range(depth): node = node.children[0]
+                return node
+            node = parent
+            depth += 1
+        return None
+
+    def _first_key(self, node):
+        while not node.leaf: node = node.children[0]
+        return node.keys[0] if node.keys else None
+
+    def _can_repack(self, parent, i):
+        left, right = parent.children[i], parent.children[i + 1]
+        size = len(left.keys) + len(right.keys) + (0 if left.leaf else 1)
+        # Só funde se o pai não ficar abaixo do mínimo: assim não há propagação
+        # e cada passo tem custo limitado
+        parent_ok = parent is self.root or len(parent.keys) > self.t - 1
+        return size <= 2 * self.t - 1 and parent_ok
+
+    def _repack(self, parent, i):
+        left, right = parent.children[i], parent.children[i + 1]
+        separator = parent.keys.pop(i)
+        if left.leaf:
+            left.next = right.next
+        else:
+            left.keys.append(separator)
+        left.keys.extend(right.keys)
+        for child in right.children: child.parent = left
+        left.children.extend(right.children)
+        parent.children.pop(i + 1)
+        if parent is self.root and not parent.keys:
+            self.root = left
+            left.parent = None
+        self._version += 1
+
+
+class BPlusTreeCursor:
+    """Cursor sobre as folhas da Árvore B+.
+
+    Guarda o caminho da raiz até a última folha visitada e recomeça as buscas
+    a partir do ancestral mais próximo que cobre a chave (finger search), de
+    modo que acessos sequenciais não descem da raiz a cada operação.
+    """
+
+    def __init__(self, tree):
+        self.tree = tree
+        # Cada entrada: (nó, índice no pai, limite inferior, limite superior)
+        self._path = []
+        self._pos = 0
+        self._key = None
+        # Fora das chaves: 1 depois da última, -1 antes da primeira, 0 sobre uma chave
+        self._edge = 0
+        self._version = None
+
+    @property
+    def key(self):
+        return self._key
+
+    def seek(self, k):
+        # Posiciona o cursor na menor chave >= k
+        leaf = self._locate(k)
+        self._pos = bisect_left(leaf.keys, k)
+        while self._pos == len(leaf.keys):
+            if not self._step_leaf(1): break
+            leaf = self._path[-1][0]
+            self._pos = 0
+        return self._sync()
+
+    def next(self):
+        if not self._path:
+            raise ValueError("Cursor não posicionado; use seek() primeiro.")
+        if not self._is_fresh():
+            k = self._key
+            if k is None:
+                if self._edge > 0: return None
+                # Antes do início: a primeira chave pode ter mudado, recomeça por ela
+                self._seek_edge(-1)
+                self._pos = 0
+                return self._sync()
+            if self.seek(k) != k: return self._key # A chave atual foi removida
+        leaf = self._path[-1][0]
+        if self._pos < len(leaf.keys): self._pos += 1
+        while self._pos >= len(leaf.keys):
+            if not self._step_leaf(1):
+                self._pos = len(leaf.keys)
+                break
+            leaf = self._path[-1][0]
+            self._pos = 0
+        return self._sync()
+
+    def prev(self):
+        if not self._path:
+            raise ValueError("Cursor não posicionado; use seek() primeiro.")
+        if not self._is_fresh():
+            if self._key is None:
+                if self._edge < 0: return None
+                # Depois do fim: a última chave pode ter mudado, recomeça por ela
+                leaf = self._seek_edge(1)
+                self._pos = len(leaf.keys) - 1
+                return self._sync()
+            self.seek(self._key)
+        leaf = self._path[-1][0]
+        if self._pos >= 0: self._pos -= 1
+        while self._pos < 0:
+            if not self._step_leaf(-1):
+                self._pos = -1
+                break
+            leaf = self._path[-1][0]
+            self._pos = len(leaf.keys) - 1
+        return self._sync()
+
+    def insert_here(self, k):
+        tree = self.tree
+        leaf = self._locate(k)
+        pos = bisect_left(leaf.keys, k)
+        if pos < len(leaf.keys) and leaf.keys[pos] == k:
+            self._pos = pos
+            self._sync()
+            return False
+        if len(leaf.keys) < 2 * tree.t - 1:
+            # Caminho rápido: a folha do cursor cobre a chave e tem espaço
+            leaf.keys.insert(pos, k)
+            tree._version += 1
+            self._version = tree._version
+            self._pos = pos
+            self._sync()
+            return True
+        # Folha cheia: o split fica a cargo da inserção normal da árvore
+        tree.insert(k)
+        self.seek(k)
+        return True
+
+    def _is_fresh(self):
+        return bool(self._path) and self._version == self.tree._version
+
+    def _sync(self):
+        leaf = self._path[-1][0]
+        if self._pos < 0:
+            self._edge = -1
+        elif self._pos >= len(leaf.keys):
+            self._edge = 1
+        else:
+            self._edge = 0
+        self._key = leaf.keys[self._pos] if self._edge == 0 else None
+        return self._key
+
+    def _seek_edge(self, direction):
+        # Refaz o caminho até a primeira (direction = -1) ou última (1) folha
+        self._path[:] = [(self.tree.root, None, None, None)]
+        self._version = self.tree._version
+        return self._descend_edge(-direction)
+
+    def _locate(self, k):
+        path = self._path
+        if not self._is_fresh():
+            path[:] = [(self.tree.root, None, None, None)]
+            self._version = self.tree._version
+        else:
+            # Sobe só até o primeiro ancestral cujo intervalo contém k
+            while len(path) > 1 and not self._covers(path[-1], k): path.pop()
+        node, _, lo, hi = path[-1]
+        while not node.leaf:
+            i = bisect_right(node.keys, k)
+            lo, hi = self._child_bounds(node, i, lo, hi)
+            node = node.children[i]
+            path.append((node, i, lo, hi))
+        return node
+
+    def _step_leaf(self, direction):
+        # Move o caminho para a folha vizinha (direction = 1 ou -1)
+        path = self._path
+        saved = list(path)
+        while len(path) > 1:
+            _, i, _, _ = path.pop()
+            parent, _, lo, hi = path[-1]
+            j = i + direction
+            if 0 <= j < len(parent.children):
+                lo, hi = self._child_bounds(parent, j, lo, hi)
+                node = parent.children[j]
+                path.append((node, j, lo, hi))
+                self._descend_edge(direction)
+                return True
+        path[:] = saved
+        return False
+
+    def _descend_edge(self, direction):
+        # Desce do fim do caminho pela borda esquerda (direction = 1) ou direita (-1)
+        path = self._path
+        node, _, lo, hi = path[-1]
+        while not node.leaf:
+            j = 0 if direction > 0 else len(node.children) - 1
+            lo, hi = self._child_bounds(node, j, lo, hi)
+            node = node.children[j]
+            path.append((node, j, lo, hi))
+        return node
+
+    @staticmethod
+    def _covers(entry, k):
+        _, _, lo, hi = entry
+        return (lo is None or lo <= k) and (hi is None or k < hi)
+
+    @staticmethod
+    def _child_bounds(node, i, lo, hi):
+        return (node.keys[i - 1] if i > 0 else lo,
+                node.keys[i] if i < len(node.keys) else hi)
+
 
 # --------------------------------------------------------------------------
 # PARTE 2: INTERFACE GRÁFICA (FRONTEND - SEM MUDANÇAS)